@@ -8,21 +8,72 @@ import os
 import signal
 import atexit
 import sys
+import threading
 
 class AllegroHand:
-    def __init__(self, host='localhost', port=12321, grasp_path=None):
+    # Preformatted SET_JOINTS command, filled with a tuple of 16 floats
+    _FMT = b"SET_JOINTS " + b" ".join([b"%.6f"] * 16) + b"\n"
+
+    # Binary protocol: opcode byte + 16 little-endian float32, acked by one byte
+    _OP_SET_JOINTS_BIN = b"\x01"
+    _ACK_OK_BIN = b"\x00"
+
+    # Socket buffer size, set before connecting to skip kernel auto-tuning
+    _SOCK_BUF_SIZE = 65536
+
+    # Unix-domain socket the grasp server also listens on for local clients
+    UNIX_SOCKET_PATH = '/tmp/allegro_hand.{port}.sock'
+
+    def __init__(self, host='localhost', port=12321, grasp_path=None, binary=True,
+                 max_in_flight=8, ack_timeout=1.0, unix_socket=True):
         """Initialize connection to Allegro Hand server
         
         Args:
             host: Server hostname
             port: Server port
             grasp_path: Path to the grasp executable. If None, will try to find it
+            binary: Send joint commands using the binary protocol instead of text
+            max_in_flight: Maximum number of unacknowledged async commands
+            ack_timeout: Seconds to wait for acknowledgments before giving up
+            unix_socket: Try the server's Unix-domain socket for this port before TCP
+                when host is local
         """
         self.host = host
         self.port = port
+        self.unix_path = self.UNIX_SOCKET_PATH.format(port=port) if unix_socket else None
+        self.binary = binary
+        self.max_in_flight = max_in_flight
+        self.ack_timeout = ack_timeout
         self.socket = None
+        self._use_quickack = False
+        self.grasp_path = None
         self.grasp_process = None
         
+        # Acknowledgment tracking for pipelined (async) commands
+        self._ack_cond = threading.Condition()
+        self._ack_thread = None
+        self._outstanding = 0
+        self._failed = 0
+        
+        # Reusable buffer for text protocol acknowledgments
+        self._ack_buf = bytearray(4)
+        
+        # Reusable binary frame; joint values are written through a float32 view
+        self._frame = bytearray(self._OP_SET_JOINTS_BIN + bytes(16 * 4))
+        self._frame_values = np.frombuffer(self._frame, dtype='<f4', offset=1)
+        
+        # Register cleanup on exit
+        atexit.register(self.cleanup)
+        
+        # Reuse a grasp server that is already running in another process
+        try:
+            sock = self._open_socket(timeout=0.2)
+        except OSError:
+            sock = None
+        if sock is not None:
+            self._set_socket(sock)
+            return
+        
         # Find grasp executable
         if grasp_path is None:
             # Try common locations
@@ -41,16 +92,10 @@ class AllegroHand:
         
         self.grasp_path = os.path.abspath(grasp_path)
         
-        # Register cleanup on exit
-        atexit.register(self.cleanup)
-        
         # Start grasp program
         self.start_grasp()
         
-        # Wait a bit for the server to start
-        time.sleep(2)
-        
-        # Connect to the server
+        # Connect to the server as soon as it is listening
         self.connect()
         
     def start_grasp(self):
@@ -63,7 +108,7 @@ class AllegroHand:
                     self.grasp_path,
                     stdout=devnull,
                     stderr=devnull,
-                    preexec_fn=os.setsid  # Create new process group
+                    start_new_session=True  # Create new process group without preexec_fn
                 )
         except Exception as e:
             print(f"Failed to start grasp program: {e}")
@@ -71,14 +116,14 @@ class AllegroHand:
         
     def cleanup(self):
         """Cleanup resources"""
-        if self.socket:
+        if self.socket and self.grasp_process:
             try:
                 # Try to send a quit command to the grasp program
                 self.socket.send("QUIT\n".encode())
                 time.sleep(0.1)  # Give it a moment to process
             except:
                 pass  # Ignore any socket errors during cleanup
-            self.close()
+        self.close()
         
         if self.grasp_process:
             try:
@@ -101,25 +146,195 @@ class AllegroHand:
             finally:
                 self.grasp_process = None
         
-    def connect(self):
-        """Connect to the Allegro Hand server"""
-        max_attempts = 5
+    def _open_socket(self, timeout=None):
+        """Open a socket connected to the Allegro Hand server
+        
+        Local servers are reached over the Unix-domain socket when available,
+        falling back to TCP otherwise.
+        """
+        if self.unix_path and self.host in ('localhost', '127.0.0.1'):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(timeout)
+                sock.connect(self.unix_path)
+                sock.settimeout(None)
+                return sock
+            except OSError:
+                sock.close()
+        
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            # Disable Nagle so each short command is flushed immediately
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self._SOCK_BUF_SIZE)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self._SOCK_BUF_SIZE)
+            sock.settimeout(timeout)
+            sock.connect((self.host, self.port))
+            sock.settimeout(None)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+    
+    @staticmethod
+    def _ping(sock, timeout):
+        """Check that the server answers commands on a freshly opened socket"""
+        try:
+            sock.settimeout(timeout)
+            sock.sendall(b"PING\n")
+            response = b""
+            while len(response) < 3:
+                data = sock.recv(3 - len(response))
+                if not data:
+                    return False
+                response += data
+            sock.settimeout(None)
+            return response == b"OK\n"
+        except OSError:
+            return False
+    
+    def _quickack(self, sock):
+        """Ask Linux to ACK immediately; the kernel clears this after each read"""
+        if self._use_quickack:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+    
+    def _set_socket(self, sock):
+        """Use a freshly connected socket for all further commands"""
+        # The server handles one client at a time and servers built before the
+        # binary protocol do not know PING, so fail fast instead of waiting on
+        # acks that never come
+        if not self._ping(sock, timeout=0.5):
+            sock.close()
+            print(f"Allegro Hand server at {self.host}:{self.port} did not answer. "
+                  "It is busy with another client, or grasp was built before the "
+                  "binary protocol and needs to be rebuilt.")
+            self.cleanup()
+            sys.exit(1)
+        
+        self.socket = sock
+        self._use_quickack = hasattr(socket, 'TCP_QUICKACK') and sock.family == socket.AF_INET
+        self._quickack(sock)
+        if sock.family == socket.AF_UNIX:
+            print(f"Connected to Allegro Hand server at {self.unix_path}")
+        else:
+            print(f"Connected to Allegro Hand server at {self.host}:{self.port}")
+        if self.binary:
+            self._start_ack_thread()
+    
+    def connect(self, timeout=5.0):
+        """Connect to the Allegro Hand server, polling until it accepts connections
+        
+        Retries start after 50 ms and back off exponentially so a server that
+        comes up quickly is picked up almost immediately.
+        
+        Args:
+            timeout: Maximum time to keep retrying in seconds
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.05
         attempt = 0
-        while attempt < max_attempts:
+        while True:
+            attempt += 1
             try:
-                self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.socket.connect((self.host, self.port))
-                print(f"Connected to Allegro Hand server at {self.host}:{self.port}")
+                self._set_socket(self._open_socket())
                 return
-            except Exception as e:
-                attempt += 1
-                if attempt < max_attempts:
-                    print(f"Connection attempt {attempt} failed: {e}. Retrying...")
-                    time.sleep(1)
-                else:
-                    print(f"Failed to connect after {max_attempts} attempts: {e}")
+            except OSError as e:
+                remaining = deadline - time.monotonic()
+                exited = self.grasp_process is not None and self.grasp_process.poll() is not None
+                if remaining <= 0 or exited:
+                    reason = "grasp program exited" if exited else e
+                    print(f"Failed to connect after {attempt} attempts: {reason}")
                     self.cleanup()
                     sys.exit(1)
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, 0.5)
+    
+    def _start_ack_thread(self):
+        """Start the background thread that drains binary acknowledgments"""
+        with self._ack_cond:
+            self._outstanding = 0
+            self._failed = 0
+        self._ack_thread = threading.Thread(target=self._ack_loop, args=(self.socket,), daemon=True)
+        self._ack_thread.start()
+    
+    def _ack_loop(self, sock):
+        """Consume acknowledgments for commands sent by set_joint_positions_async"""
+        buf = bytearray(1024)
+        while True:
+            try:
+                n = sock.recv_into(buf)
+                if not n:
+                    break
+                self._quickack(sock)
+            except OSError:
+                break
+            with self._ack_cond:
+                self._failed += n - buf.count(self._ACK_OK_BIN, 0, n)
+                self._outstanding = max(0, self._outstanding - n)
+                self._ack_cond.notify_all()
+        
+        # Connection is gone, so pending commands will never be acknowledged
+        with self._ack_cond:
+            self._failed += self._outstanding
+            self._outstanding = 0
+            self._ack_cond.notify_all()
+    
+    def set_joint_positions_async(self, positions):
+        """Send joint positions without waiting for the acknowledgment
+        
+        Blocks only while max_in_flight commands are still unacknowledged.
+        Use flush() to wait for all pending acknowledgments.
+        
+        Args:
+            positions: List/array of 16 joint angles in radians
+        """
+        # Convert once; float32 arrays pass through without a copy
+        payload = np.asarray(positions, dtype='<f4')
+        if payload.shape != (16,):
+            raise ValueError("Must provide exactly 16 joint positions")
+        
+        if not self.binary:
+            raise RuntimeError("async commands require binary=True")
+        
+        if not self.socket or not self._ack_thread:
+            print("Not connected to server")
+            return False
+        
+        with self._ack_cond:
+            if not self._ack_cond.wait_for(
+                    lambda: self._outstanding < self.max_in_flight or not self._ack_thread.is_alive(),
+                    self.ack_timeout):
+                print("Timed out waiting for acknowledgments from server")
+                return False
+            self._outstanding += 1
+        
+        try:
+            self._frame_values[:] = payload
+            self.socket.sendall(self._frame)
+            return True
+        except Exception as e:
+            with self._ack_cond:
+                self._outstanding = max(0, self._outstanding - 1)
+                self._ack_cond.notify_all()
+            print(f"Failed to send joint positions: {e}")
+            return False
+    
+    def flush(self, timeout=None):
+        """Wait until all async commands have been acknowledged
+        
+        Args:
+            timeout: Maximum time to wait in seconds. None waits indefinitely
+        
+        Returns:
+            True if every command since the last flush was acknowledged with OK
+        """
+        with self._ack_cond:
+            if not self._ack_cond.wait_for(lambda: self._outstanding == 0, timeout):
+                return False
+            ok = self._failed == 0
+            self._failed = 0
+            return ok
             
     def set_joint_positions(self, positions):
         """Set joint positions for all joints
@@ -127,6 +342,14 @@ class AllegroHand:
         Args:
             positions: List/array of 16 joint angles in radians
         """
+        if self.binary:
+            if not self.set_joint_positions_async(positions):
+                return False
+            if not self.flush(timeout=self.ack_timeout):
+                print("Server did not acknowledge joint positions")
+                return False
+            return True
+        
         if len(positions) != 16:
             raise ValueError("Must provide exactly 16 joint positions")
             
@@ -135,13 +358,16 @@ class AllegroHand:
             return False
             
         try:
-            # Format command string
-            cmd = "SET_JOINTS " + " ".join([f"{p:.6f}" for p in positions]) + "\n"
-            self.socket.send(cmd.encode())
+            # Format command bytes directly from the cached template
+            if isinstance(positions, np.ndarray):
+                positions = positions.tolist()
+            cmd = self._FMT % tuple(positions)
+            self.socket.sendall(cmd)
             
             # Wait for acknowledgment
-            response = self.socket.recv(1024).decode().strip()
-            return response == "OK"
+            n = self.socket.recv_into(self._ack_buf)
+            self._quickack(self.socket)
+            return self._ack_buf.startswith(b"OK", 0, n)
         except Exception as e:
             print(f"Failed to send joint positions: {e}")
             return False
@@ -149,8 +375,20 @@ class AllegroHand:
     def close(self):
         """Close connection to server"""
         if self.socket:
+            if self._ack_thread:
+                # Collect acks still in flight so the server is not left writing
+                # to a closed connection
+                self.flush(self.ack_timeout)
+            try:
+                # Wake up the acknowledgment thread blocked in recv()
+                self.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
             self.socket.close()
             self.socket = None
+        if self._ack_thread:
+            self._ack_thread.join(timeout=1)
+            self._ack_thread = None
 
 def demo():
     """Demo showing basic usage"""
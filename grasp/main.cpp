@@ -12,7 +12,10 @@
 #include <pthread.h>
 #include <sys/socket.h>
 #include <netinet/in.h>
+#include <netinet/tcp.h>
 #include <arpa/inet.h>
+#include <sys/un.h>
+#include <poll.h>
 #include "canAPI.h"
 #include "rDeviceAllegroHandCANDef.h"
 #include "RockScissorsPaper.h"
@@ -82,17 +85,49 @@ bool bRun = true;
 
 // TCP server settings
 #define TCP_PORT 12321
+#define TCP_BUF_SIZE 65536
+
+// Unix-domain socket for clients on the same host (bypasses the TCP/IP stack),
+// named after the TCP port so clients of different servers never mix
+#define UNIX_SOCKET_PATH_FMT "/tmp/allegro_hand.%d.sock"
+
+// Binary protocol opcodes (text commands always start with a printable letter)
+#define OP_SET_JOINTS_BIN 0x01  // followed by MAX_DOF little-endian float32 values
+#define ACK_OK_BIN        0x00
+
 bool tcpThreadRun = false;
 pthread_t tcpThread;
 int server_fd;
+int unix_fd = -1;
+char unix_socket_path[108];  // size of sockaddr_un::sun_path on Linux
 
 // Add at the top with other global variables
 struct termios orig_termios;  // Store original terminal settings
 
-// Function to handle TCP client connections
+// Re-enable immediate ACKs; Linux clears TCP_QUICKACK after each read
+static void QuickAck(int fd) {
+#ifdef TCP_QUICKACK
+    int quickack = 1;
+    setsockopt(fd, IPPROTO_TCP, TCP_QUICKACK, &quickack, sizeof(quickack));
+#endif
+}
+
+// Read exactly len bytes from a socket; returns false on disconnect or error
+static bool ReadFull(int fd, void* buf, size_t len, bool quickack) {
+    char* p = (char*)buf;
+    while (len > 0) {
+        ssize_t n = read(fd, p, len);
+        if (n <= 0) return false;
+        if (quickack) QuickAck(fd);
+        p += n;
+        len -= n;
+    }
+    return true;
+}
+
+// Function to handle TCP and Unix-domain client connections
 static void* tcpThreadProc(void* inst) {
     struct sockaddr_in address;
-    int addrlen = sizeof(address);
     char buffer[1024] = {0};
     
     // Creating socket file descriptor
@@ -107,6 +142,11 @@ static void* tcpThreadProc(void* inst) {
         return NULL;
     }
     
+    // Fixed buffer sizes are inherited by accepted sockets
+    int bufsize = TCP_BUF_SIZE;
+    setsockopt(server_fd, SOL_SOCKET, SO_SNDBUF, &bufsize, sizeof(bufsize));
+    setsockopt(server_fd, SOL_SOCKET, SO_RCVBUF, &bufsize, sizeof(bufsize));
+    
     address.sin_family = AF_INET;
     address.sin_addr.s_addr = INADDR_ANY;
     address.sin_port = htons(TCP_PORT);
@@ -123,21 +163,93 @@ static void* tcpThreadProc(void* inst) {
     
     printf("TCP server listening on port %d\n", TCP_PORT);
     
+    // Also listen on a Unix-domain socket for local clients, unless another
+    // running server still owns the path
+    struct sockaddr_un unix_address;
+    memset(&unix_address, 0, sizeof(unix_address));
+    unix_address.sun_family = AF_UNIX;
+    snprintf(unix_socket_path, sizeof(unix_socket_path), UNIX_SOCKET_PATH_FMT, TCP_PORT);
+    strncpy(unix_address.sun_path, unix_socket_path, sizeof(unix_address.sun_path) - 1);
+    
+    int probe_fd = socket(AF_UNIX, SOCK_STREAM, 0);
+    bool unix_in_use = probe_fd >= 0 &&
+        connect(probe_fd, (struct sockaddr *)&unix_address, sizeof(unix_address)) == 0;
+    if (probe_fd >= 0) close(probe_fd);
+    
+    if (unix_in_use) {
+        printf("%s is used by another server, accepting TCP clients only\n", unix_socket_path);
+    }
+    else {
+        // Remove a stale socket file left behind by a server that exited
+        unlink(unix_socket_path);
+        if ((unix_fd = socket(AF_UNIX, SOCK_STREAM, 0)) < 0 ||
+            bind(unix_fd, (struct sockaddr *)&unix_address, sizeof(unix_address)) < 0 ||
+            listen(unix_fd, 3) < 0) {
+            printf("Unix socket setup failed, accepting TCP clients only\n");
+            if (unix_fd >= 0) close(unix_fd);
+            unix_fd = -1;
+        }
+        else {
+            printf("Unix socket listening on %s\n", unix_socket_path);
+        }
+    }
+    
     while (tcpThreadRun) {
+        // Wait for a client on either socket; the timeout lets us notice shutdown
+        struct pollfd fds[2] = {{server_fd, POLLIN, 0}, {unix_fd, POLLIN, 0}};
+        if (poll(fds, unix_fd >= 0 ? 2 : 1, 200) <= 0) {
+            continue;
+        }
+        
+        bool is_tcp = (fds[0].revents != 0);
         int client_socket;
-        if ((client_socket = accept(server_fd, (struct sockaddr *)&address, (socklen_t*)&addrlen)) < 0) {
-            printf("TCP accept failed\n");
+        if ((client_socket = accept(is_tcp ? server_fd : unix_fd, NULL, NULL)) < 0) {
+            printf("%s accept failed\n", is_tcp ? "TCP" : "Unix socket");
             continue;
         }
         
-        printf("New client connected\n");
+        printf("New %s client connected\n", is_tcp ? "TCP" : "Unix socket");
+        
+        if (is_tcp) {
+            // Disable Nagle so acknowledgments are sent immediately
+            int nodelay = 1;
+            setsockopt(client_socket, IPPROTO_TCP, TCP_NODELAY, &nodelay, sizeof(nodelay));
+            QuickAck(client_socket);
+        }
         
         while (tcpThreadRun) {
-            int valread = read(client_socket, buffer, 1024);
+            // Read the first byte to tell binary frames from text commands
+            int valread = read(client_socket, buffer, 1);
             if (valread <= 0) {
                 printf("Client disconnected\n");
                 break;
             }
+            if (is_tcp) QuickAck(client_socket);
+            
+            if ((unsigned char)buffer[0] == OP_SET_JOINTS_BIN) {
+                // Format: opcode + MAX_DOF float32 values
+                float values[MAX_DOF];
+                if (!ReadFull(client_socket, values, sizeof(values), is_tcp)) {
+                    printf("Client disconnected\n");
+                    break;
+                }
+                for (int i = 0; i < MAX_DOF; i++) q_des[i] = values[i];
+                
+                if (pBHand) pBHand->SetMotionType(eMotionType_JOINT_PD);
+                
+                // Send acknowledgment
+                const char ack = ACK_OK_BIN;
+                send(client_socket, &ack, 1, MSG_NOSIGNAL);
+                buffer[0] = 0;
+                continue;
+            }
+            
+            valread = read(client_socket, buffer + 1, sizeof(buffer) - 2);
+            if (valread <= 0) {
+                printf("Client disconnected\n");
+                break;
+            }
+            if (is_tcp) QuickAck(client_socket);
             
             // Parse joint values from buffer
             // Format: "SET_JOINTS val1 val2 val3 ... val16"
@@ -154,11 +266,15 @@ static void* tcpThreadProc(void* inst) {
                 if (pBHand) pBHand->SetMotionType(eMotionType_JOINT_PD);
                 
                 // Send acknowledgment
-                send(client_socket, "OK\n", 3, 0);
+                send(client_socket, "OK\n", 3, MSG_NOSIGNAL);
+            }
+            else if (strncmp(buffer, "PING", 4) == 0) {
+                // Lets a client check that this server is serving it
+                send(client_socket, "OK\n", 3, MSG_NOSIGNAL);
             }
             else if (strncmp(buffer, "QUIT", 4) == 0) {
                 // Acknowledge quit command
-                send(client_socket, "OK\n", 3, 0);
+                send(client_socket, "OK\n", 3, MSG_NOSIGNAL);
                 // Signal main loop to exit
                 bRun = false;
                 break;
@@ -171,6 +287,10 @@ static void* tcpThreadProc(void* inst) {
     }
     
     close(server_fd);
+    if (unix_fd >= 0) {
+        close(unix_fd);
+        unlink(unix_socket_path);
+    }
     return NULL;
 }
 
@@ -547,6 +667,7 @@ void MainLoop()
     // Stop TCP server thread
     tcpThreadRun = false;
     shutdown(server_fd, SHUT_RDWR);
+    if (unix_fd >= 0) shutdown(unix_fd, SHUT_RDWR);
     pthread_join(tcpThread, NULL);
     
     // Ensure terminal is restored